@@ -1,4 +1,21 @@
+import argparse
+import hashlib
+import json
+import math
+import os
+import sys
+
 from pulp import (
+    CUOPT,
+    GUROBI_CMD,
+    HiGHS_CMD,
+    PULP_CBC_CMD,
+    SCIP_CMD,
+    LpAffineExpression,
+    LpConstraint,
+    LpConstraintEQ,
+    LpConstraintGE,
+    LpConstraintLE,
     LpProblem,
     LpMinimize,
     LpVariable,
@@ -9,8 +26,36 @@ from pulp import (
     LpStatusInfeasible,
     LpStatusUnbounded,
     LpStatusNotSolved,
+    LpSolver,
 )
 
+# Solver names accepted by get_solver, --solver and CARRIER_SOLVER
+SOLVERS = ("cbc", "highs", "scip", "gurobi", "cuopt")
+
+# Extra CBC options: full preprocessing and more strong branching candidates
+# per node, which pays off on models with many tier flags
+CBC_OPTIONS = ["preprocess on", "strong 20"]
+
+# Last solution, fed back to the solver as a MIP start on the next run
+WARM_START_PATH = "warmstart.json"
+
+# Optimal solutions keyed by a hash of the input parameters
+SOLUTION_CACHE_DIR = "cache"
+# part of every cache key; bump when the cached solution layout changes
+SOLUTION_CACHE_VERSION = 3
+
+# keys of the parameter dict and the JSON type of each, as read from a
+# --config file
+CONFIG_TYPES = {
+    "num_years": int,
+    "carriers": list,
+    "destinations": list,
+    "shipment_target": list,
+    "shipment_cost": dict,
+    "tier_min_quantity": list,
+    "discount_rate": dict,
+}
+
 
 def optimize_shipments(
     num_years: int,
@@ -23,344 +68,488 @@ def optimize_shipments(
     tier_min_quantity: list[int],
     # discount_rate[carrier][tier] == discount multiplier for carrier at tier
     discount_rate: dict[str, list[float]],
-) -> LpProblem:
+) -> tuple[
+    LpProblem,
+    dict[tuple[int, str, str], LpVariable],
+    list[dict[str, dict[int, LpVariable]]],
+]:
     problem = LpProblem("Carrier_Optimization", LpMinimize)
 
-    # DECISION VARIABLES: shipments in year at tier from carrier to destination
-    # Ordered as: year -> carrier -> tier -> destination
-    shipment_at_tier = {}
-    for year in range(num_years):
-        shipment_at_tier[year] = {}
-        for carrier in carriers:
-            shipment_at_tier[year][carrier] = {}
-            for tier in range(len(tier_min_quantity)):
-                shipment_at_tier[year][carrier][tier] = {}
-                for dest in destinations:
-                    shipment_at_tier[year][carrier][tier][dest] = LpVariable(
-                        f"ship_y{year}_{carrier}_t{tier}_{dest}",
-                        lowBound=0,
-                        upBound=shipment_target[year][dest],
-                        cat="Integer",
-                    )
+    n_tiers = len(tier_min_quantity)
+    tier_range = range(n_tiers)
+    year_range = range(num_years)
+
+    # targets by position, target_rows[year][dest_index], read once from the dicts
+    target_rows = [
+        [shipment_target[year][dest] for dest in destinations] for year in year_range
+    ]
+
+    # total shipments due in each year, the most any one carrier can take
+    year_target = [sum(row) for row in target_rows]
 
-    # Binary variables for tier selection
-    # Ordered as: year -> carrier -> tier
+    # Costs by position, cost_rows[carrier][dest_index], read once from the dicts
+    cost_rows = {
+        carrier: [shipment_cost[carrier][dest] for dest in destinations]
+        for carrier in carriers
+    }
+
+    # a tier whose minimum exceeds the year's total target can never be active,
+    # so its variables are not created; year_tiers[year] == reachable tiers
+    year_tiers = [
+        [tier for tier in tier_range if tier_min_quantity[tier] <= year_target[year]]
+        for year in year_range
+    ]
+
+    # DECISION VARIABLES: shipments in year from carrier to destination
+    # Keyed as: (year, carrier, destination)
+    # Shipments carry no tier index; the active tier's discount is applied to
+    # the carrier's spend below, which keeps the variable count independent of
+    # the number of tiers.
+    # Shipments are continuous, only the tier flags need branching. Once the
+    # flags are fixed, the inactive tiers' spend is held at 0 and the spend
+    # row sets the active tier's spend to the carrier's cost, so spend can be
+    # substituted out of the objective. The shipments are then left with the
+    # destination rows and the carrier minimum rows, a bipartite
+    # transportation matrix whose vertices are integral for integer targets
+    # and tier minimums.
+    # Names use positions rather than carrier/destination names to keep the
+    # model file the solver reads small: s_{year}_{carrier}_{dest}
+    shipments = {}
+    # dest_vars[year][dest_index] == all carrier shipment variables to dest
+    dest_vars = [[[] for _ in destinations] for _ in year_range]
+    # carrier_vars[year][carrier] == shipment variables via carrier, by dest index
+    carrier_vars = [{carrier: [] for carrier in carriers} for _ in year_range]
+    for year in year_range:
+        for ci, carrier in enumerate(carriers):
+            for di, dest in enumerate(destinations):
+                var = LpVariable(
+                    f"s_{year}_{ci}_{di}",
+                    lowBound=0,
+                    upBound=target_rows[year][di],
+                    cat="Continuous",
+                )
+                shipments[(year, carrier, dest)] = var
+                dest_vars[year][di].append(var)
+                carrier_vars[year][carrier].append(var)
+
+    # Binary variables for tier selection, named t_{year}_{carrier}_{tier}
+    # Ordered as: year -> carrier -> tier, reachable tiers only
     tier_flag = []
-    for year in range(num_years):
+    for year in year_range:
         tier_flag.append({})
-        for carrier in carriers:
-            tier_flag[year][carrier] = [
-                LpVariable(f"tier_y{year}_{carrier}_t{tier}", cat="Binary")
-                for tier in range(len(tier_min_quantity))
-            ]
+        for ci, carrier in enumerate(carriers):
+            tier_flag[year][carrier] = LpVariable.dicts(
+                f"t_{year}_{ci}", year_tiers[year], cat="Binary"
+            )
+
+    # Undiscounted spend with a carrier, booked only at its active tier so the
+    # tier's discount multiplier applies linearly, named w_{year}_{carrier}_{tier}
+    # max_spend[year][carrier] == bound on spend, every shipment via the carrier
+    # Ordered as: year -> carrier -> tier, reachable tiers only
+    max_spend = []
+    spend = []
+    for year in year_range:
+        max_spend.append({})
+        spend.append({})
+        for ci, carrier in enumerate(carriers):
+            year_max = sum(
+                cost * target
+                for cost, target in zip(cost_rows[carrier], target_rows[year])
+            )
+            # year_max, the cost of every shipment of the year, is the most the
+            # carrier can spend. Spend is derived from the equality row of
+            # fractional costs, and CBC preprocessing does that within a
+            # tolerance; a spend that reaches year_max exactly can come out
+            # just above an exact bound, and a feasible model is then declared
+            # infeasible. A unit of slack keeps the bound from ever binding.
+            max_spend[year][carrier] = year_max + 1
+            spend[year][carrier] = LpVariable.dicts(
+                f"w_{year}_{ci}", year_tiers[year], lowBound=0
+            )
 
     # OBJECTIVE FUNCTION
-    total_cost = lpSum(
-        [
-            shipment_at_tier[year][carrier][tier][dest]
-            * shipment_cost[carrier][dest]
-            * discount_rate[carrier][tier]
-            for year in range(num_years)
-            for carrier in carriers
-            for tier in range(len(tier_min_quantity))
-            for dest in destinations
-        ]
+    # expressions are built straight from (variable, coefficient) pairs
+    total_cost = LpAffineExpression(
+        (spend[year][carrier][tier], discount_rate[carrier][tier])
+        for year in year_range
+        for carrier in carriers
+        for tier in year_tiers[year]
     )
 
     problem += total_cost, "Total_Cost"
 
     # CONSTRAINTS
-    for year in range(num_years):
-        for carrier in carriers:
-            # only 1 earned discount tier may be active per year
-            problem += lpSum(tier_flag[year][carrier]) == 1
-
-            for tier in range(len(tier_min_quantity)):
-                for dest in destinations:
-                    # shipments can only occur when tier is active
-                    problem += (
-                        shipment_at_tier[year][carrier][tier][dest]
-                        <= shipment_target[year][dest] * tier_flag[year][carrier][tier]
-                    )
+    # rows are written as (variable, coefficient) pairs with every variable on
+    # the left-hand side, so no expression arithmetic is done
+    for year in year_range:
+        for ci, carrier in enumerate(carriers):
+            flags = tier_flag[year][carrier]
+            carrier_spend = spend[year][carrier]
+            carrier_max = max_spend[year][carrier]
+            year_carrier_vars = carrier_vars[year][carrier]
+
+            # only 1 earned discount tier may be active per year; the flags are
+            # also declared as an SOS1 set for solvers that branch on SOS sets
+            problem += lpSum(flags.values()) == 1
+            problem.sos1[f"tier_sos_{year}_{ci}"] = {
+                var: tier + 1 for tier, var in flags.items()
+            }
+
+            # must meet minimum shipments for the active discount tier
+            problem += LpConstraint(
+                [(var, 1) for var in year_carrier_vars]
+                + [(flag, -tier_min_quantity[tier]) for tier, flag in flags.items()],
+                LpConstraintGE,
+                rhs=0,
+            )
 
-                # total shipments at a discount tier across all destinations
-                tier_total = lpSum(
-                    [
-                        shipment_at_tier[year][carrier][tier][dest]
-                        for dest in destinations
-                    ]
-                )
+            # spend across the tiers is the carrier's undiscounted shipment cost
+            problem += LpConstraint(
+                list(zip(year_carrier_vars, cost_rows[carrier]))
+                + [(var, -1) for var in carrier_spend.values()],
+                LpConstraintEQ,
+                rhs=0,
+            )
 
-                # must meet minimum shipments for an active discount tier
-                problem += (
-                    tier_total
-                    >= tier_min_quantity[tier] * tier_flag[year][carrier][tier]
+            # spend can only be booked at the active tier
+            for tier, flag in flags.items():
+                problem += LpConstraint(
+                    [(carrier_spend[tier], 1), (flag, -carrier_max)],
+                    LpConstraintLE,
+                    rhs=0,
                 )
 
-    # must hit shipment targets each year
-    for year in range(num_years):
-        for dest in destinations:
-            destination_total = lpSum(
-                [
-                    shipment_at_tier[year][carrier][tier][dest]
-                    for carrier in carriers
-                    for tier in range(len(tier_min_quantity))
-                ]
+        # must hit shipment targets each year
+        for year_dest_vars, target in zip(dest_vars[year], target_rows[year]):
+            problem += LpConstraint(
+                [(var, 1) for var in year_dest_vars], LpConstraintEQ, rhs=target
             )
-            problem += destination_total == shipment_target[year][dest]
 
-    return problem
+    return problem, shipments, tier_flag
 
 
-def print_solution(
+def get_solution(
     problem: LpProblem,
+    shipments: dict[tuple[int, str, str], LpVariable],
+    tier_flag: list[dict[str, dict[int, LpVariable]]],
+) -> dict:
+    """
+    Return the solved carrier model as plain data: its status and objective,
+    the shipments by (year, carrier, destination) and the tier flag values
+    by year and carrier. solve_single_carrier and the solution cache return
+    the same structure.
+    """
+    return {
+        "status": problem.status,
+        "objective": value(problem.objective),
+        # shipments[(year, carrier, dest)] == shipments
+        "shipments": {key: var.varValue or 0 for key, var in shipments.items()},
+        # tiers[year][carrier][tier] == tier selection value, reachable tiers only
+        "tiers": [
+            {
+                carrier: {tier: var.varValue or 0 for tier, var in flags.items()}
+                for carrier, flags in year_flags.items()
+            }
+            for year_flags in tier_flag
+        ],
+    }
+
+
+def solve_single_carrier(
     num_years: int,
     carriers: list[str],
     destinations: list[str],
     shipment_target: list[dict[str, float]],
+    shipment_cost: dict[str, dict[str, float]],
     tier_min_quantity: list[int],
     discount_rate: dict[str, list[float]],
-) -> None:
+) -> dict:
     """
-    Pretty print the solution of the shipment optimization problem.
+    Solve the single carrier case without building a model. The carrier takes
+    every shipment, so each year only the cheapest reachable tier is chosen.
+    Returns the same dict as get_solution.
     """
+    (carrier,) = carriers
+    rates = discount_rate[carrier]
+    objective = 0
+    shipments = {}
+    tiers = []
+    for year in range(num_years):
+        year_targets = shipment_target[year]
+        year_target = sum(year_targets.values())
+        reachable = [
+            tier
+            for tier, min_qty in enumerate(tier_min_quantity)
+            if min_qty <= year_target
+        ]
+        active_tier = min(reachable, key=rates.__getitem__)
+
+        spend = sum(
+            shipment_cost[carrier][dest] * year_targets[dest] for dest in destinations
+        )
+        objective += rates[active_tier] * spend
+        for dest in destinations:
+            shipments[(year, carrier, dest)] = year_targets[dest]
+        tiers.append({carrier: {tier: int(tier == active_tier) for tier in reachable}})
+
+    return {
+        "status": LpStatusOptimal,
+        "objective": objective,
+        "shipments": shipments,
+        "tiers": tiers,
+    }
 
-    print("\n" + "=" * 80)
-    print("SHIPMENT OPTIMIZATION RESULTS")
-    print("=" * 80)
 
-    status_code = problem.status
+def format_solution(
+    # solution as returned by get_solution
+    solution: dict,
+    num_years: int,
+    carriers: list[str],
+    destinations: list[str],
+    shipment_target: list[dict[str, float]],
+    tier_min_quantity: list[int],
+    discount_rate: dict[str, list[float]],
+) -> list[str]:
+    """
+    Format the solution of the shipment optimization problem as report lines.
+    """
+    lines = []
+
+    lines.append("\n" + "=" * 80)
+    lines.append("SHIPMENT OPTIMIZATION RESULTS")
+    lines.append("=" * 80)
+
+    status_code = solution["status"]
     status_name = LpStatus[status_code]
+    objective_value = solution["objective"]
 
-    print(f"\nSolver Status: {status_name} (code: {status_code})")
+    lines.append(f"\nSolver Status: {status_name} (code: {status_code})")
 
     # Handle different solution statuses
     if status_code == LpStatusOptimal:
-        print(f"Optimal Total Cost: ${value(problem.objective):,.2f}")
+        lines.append(f"Optimal Total Cost: ${objective_value:,.2f}")
 
     elif status_code == LpStatusInfeasible:
-        print("\n⚠ PROBLEM IS INFEASIBLE ⚠")
-        print("\nThe constraints cannot be satisfied simultaneously.")
-        print("\nPossible reasons:")
-        print("  1. Shipment targets exceed combined carrier capacity at any tier")
-        print(
+        lines.append("\n⚠ PROBLEM IS INFEASIBLE ⚠")
+        lines.append("\nThe constraints cannot be satisfied simultaneously.")
+        lines.append("\nPossible reasons:")
+        lines.append(
+            "  1. Shipment targets exceed combined carrier capacity at any tier"
+        )
+        lines.append(
             "  2. Individual destination targets exceed any single carrier's capacity"
         )
-        print("  3. Minimum tier quantities are too high to achieve with given targets")
-        print(
+        lines.append(
+            "  3. Minimum tier quantities are too high to achieve with given targets"
+        )
+        lines.append(
             "  4. Conflicting constraints between tier requirements and shipment bounds"
         )
 
-        print("\nDiagnostic Information:")
-        print(
+        lines.append("\nDiagnostic Information:")
+        lines.append(
             f"  Total shipments needed (all years): {sum(sum(shipment_target[y].values()) for y in range(num_years)):,.0f}"
         )
-        print(f"  Number of carriers: {len(carriers)}")
-        print(f"  Number of destinations: {len(destinations)}")
-        print(f"  Number of years: {num_years}")
+        lines.append(f"  Number of carriers: {len(carriers)}")
+        lines.append(f"  Number of destinations: {len(destinations)}")
+        lines.append(f"  Number of years: {num_years}")
 
-        print("\n  Tier minimum quantities:")
+        lines.append("\n  Tier minimum quantities:")
         for i, min_qty in enumerate(tier_min_quantity):
-            print(f"    Tier {i}: {min_qty:,} shipments")
+            lines.append(f"    Tier {i}: {min_qty:,} shipments")
 
-        print("\n  Yearly shipment targets:")
+        lines.append("\n  Yearly shipment targets:")
         for year in range(num_years):
             year_total = sum(shipment_target[year].values())
-            print(f"    Year {year}: {year_total:,.0f} total")
+            lines.append(f"    Year {year}: {year_total:,.0f} total")
             for dest in destinations:
-                print(f"      {dest}: {shipment_target[year][dest]:,.0f}")
+                lines.append(f"      {dest}: {shipment_target[year][dest]:,.0f}")
 
-        print("\nSuggestions:")
-        print("  • Check if any single destination target exceeds maximum shipments")
-        print("  • Verify tier minimums are achievable with your shipment volumes")
-        print("  • Consider adding more carriers or relaxing constraints")
-        print("  • Review if shipment bounds are too restrictive")
-        return
+        lines.append("\nSuggestions:")
+        lines.append(
+            "  • Check if any single destination target exceeds maximum shipments"
+        )
+        lines.append(
+            "  • Verify tier minimums are achievable with your shipment volumes"
+        )
+        lines.append("  • Consider adding more carriers or relaxing constraints")
+        lines.append("  • Review if shipment bounds are too restrictive")
+        return lines
 
     elif status_code == LpStatusUnbounded:  # -2 = Unbounded
-        print("\n⚠ PROBLEM IS UNBOUNDED ⚠")
-        print("\nThe objective function can be improved indefinitely.")
-        print("This suggests an error in the model formulation:")
-        print("  • Missing constraints that should limit the solution")
-        print("  • Incorrect objective function (possibly wrong sign)")
-        print("  • Variables without proper bounds")
-        return
+        lines.append("\n⚠ PROBLEM IS UNBOUNDED ⚠")
+        lines.append("\nThe objective function can be improved indefinitely.")
+        lines.append("This suggests an error in the model formulation:")
+        lines.append("  • Missing constraints that should limit the solution")
+        lines.append("  • Incorrect objective function (possibly wrong sign)")
+        lines.append("  • Variables without proper bounds")
+        return lines
 
     elif status_code == LpStatusNotSolved:  # 0 = Not Solved
-        print("\n⚠ PROBLEM NOT SOLVED ⚠")
-        print("\nThe solver did not attempt to solve or did not complete.")
-        print("Possible reasons:")
-        print("  • Solver not found or not properly installed")
-        print("  • Problem too large for available memory")
-        print("  • Timeout reached before solution found")
-        print("  • Solver configuration error")
-        return
+        lines.append("\n⚠ PROBLEM NOT SOLVED ⚠")
+        lines.append("\nThe solver did not attempt to solve or did not complete.")
+        lines.append("Possible reasons:")
+        lines.append("  • Solver not found or not properly installed")
+        lines.append("  • Problem too large for available memory")
+        lines.append("  • Timeout reached before solution found")
+        lines.append("  • Solver configuration error")
+        return lines
 
     elif status_code == -3:  # Undefined (solver-specific)
-        print("\n⚠ SOLVER RETURNED UNDEFINED STATUS ⚠")
-        print("\nThe solver encountered an issue:")
-        print("  • Numerical difficulties")
-        print("  • Model formulation issues")
-        print("  • Solver-specific error")
-        return
+        lines.append("\n⚠ SOLVER RETURNED UNDEFINED STATUS ⚠")
+        lines.append("\nThe solver encountered an issue:")
+        lines.append("  • Numerical difficulties")
+        lines.append("  • Model formulation issues")
+        lines.append("  • Solver-specific error")
+        return lines
 
     else:
-        print(f"\n⚠ UNKNOWN STATUS: {status_code} ⚠")
-        print(
-            f"Optimal Total Cost: ${value(problem.objective):,.2f}"
-            if value(problem.objective)
+        lines.append(f"\n⚠ UNKNOWN STATUS: {status_code} ⚠")
+        lines.append(
+            f"Optimal Total Cost: ${objective_value:,.2f}"
+            if objective_value
             else "Cost unavailable"
         )
-        return
+        return lines
 
     # OPTIMAL SOLUTION DISPLAY
-    # Extract variable values
-    print("\n" + "-" * 80)
-    print("SHIPMENT ALLOCATION BY YEAR")
-    print("-" * 80)
+    shipment_values = solution["shipments"]
+    tier_values = solution["tiers"]
+
+    # Totals gathered during the allocation pass for the summaries below
+    dest_totals = {dest: 0.0 for dest in destinations}
+    # carrier_year_totals[carrier][year] == (active tier, total shipments)
+    carrier_year_totals = {carrier: [(0, 0.0)] * num_years for carrier in carriers}
+
+    # the carrier table header and rule repeat for every carrier-year
+    table_header = (
+        f"\n    {'Destination':<15} {'Shipments':>12} {'Target':>12} {'Cost':>15}"
+    )
+    table_rule = f"    {'-' * 15} {'-' * 12} {'-' * 12} {'-' * 15}"
+
+    lines.append("\n" + "-" * 80)
+    lines.append("SHIPMENT ALLOCATION BY YEAR")
+    lines.append("-" * 80)
 
     for year in range(num_years):
-        print(f"\n{'Year ' + str(year):=^80}")
+        lines.append(f"\n{'Year ' + str(year):=^80}")
 
         # Calculate yearly totals
         year_total_cost = 0
         year_total_shipments = 0
 
         for carrier in carriers:
-            print(f"\n  {carrier}:")
-
-            # Find active tier for this carrier in this year
-            active_tier = None
-            for tier in range(len(tier_min_quantity)):
-                tier_var_name = f"tier_y{year}_{carrier}_t{tier}"
-                for var in problem.variables():
-                    if var.name == tier_var_name and value(var) > 0.5:
-                        active_tier = tier
-                        break
-                if active_tier is not None:
-                    break
+            lines.append(f"\n  {carrier}:")
 
-            if active_tier is not None:
-                discount_pct = (1 - discount_rate[carrier][active_tier]) * 100
-                print(
-                    f"    Active Tier: {active_tier} (Discount: {discount_pct:.1f}%, Multiplier: {discount_rate[carrier][active_tier]:.3f})"
-                )
-                print(f"    Min Required: {tier_min_quantity[active_tier]:,} shipments")
+            # The tier flags are a 1-of-T indicator, the active tier is the argmax
+            carrier_tiers = tier_values[year][carrier]
+            active_tier = max(carrier_tiers, key=carrier_tiers.get)
+            rate = discount_rate[carrier][active_tier]
+
+            discount_pct = (1 - rate) * 100
+            lines.append(
+                f"    Active Tier: {active_tier} (Discount: {discount_pct:.1f}%, Multiplier: {rate:.3f})"
+            )
+            lines.append(
+                f"    Min Required: {tier_min_quantity[active_tier]:,} shipments"
+            )
 
             # Calculate carrier totals for this year
             carrier_shipments = 0
             carrier_cost = 0
 
-            print(
-                f"\n    {'Destination':<15} {'Shipments':>12} {'Target':>12} {'Cost':>15}"
-            )
-            print(f"    {'-' * 15} {'-' * 12} {'-' * 12} {'-' * 15}")
+            lines.append(table_header)
+            lines.append(table_rule)
 
+            # shipments are billed at the carrier's active tier
             for dest in destinations:
-                dest_shipments = 0
-                dest_cost = 0
-
-                # Sum across all tiers (though only one should be non-zero)
-                for tier in range(len(tier_min_quantity)):
-                    var_name = f"ship_y{year}_{carrier}_t{tier}_{dest}"
-                    for var in problem.variables():
-                        if var.name == var_name:
-                            shipments = value(var)
-                            if shipments is not None and shipments > 0:
-                                dest_shipments += shipments
-                                dest_cost += shipments * discount_rate[carrier][tier]
-                            break
+                dest_shipments = shipment_values[(year, carrier, dest)]
+                dest_cost = dest_shipments * rate
 
                 carrier_shipments += dest_shipments
                 carrier_cost += dest_cost
+                dest_totals[dest] += dest_shipments
 
                 if dest_shipments > 0:
-                    print(
+                    lines.append(
                         f"    {dest:<15} {dest_shipments:>12,.0f} {shipment_target[year][dest]:>12,.0f} ${dest_cost:>14,.2f}"
                     )
 
-            print(f"    {'-' * 15} {'-' * 12} {'-' * 12} {'-' * 15}")
-            print(
+            lines.append(table_rule)
+            lines.append(
                 f"    {'CARRIER TOTAL':<15} {carrier_shipments:>12,.0f} {'':>12} ${carrier_cost:>14,.2f}"
             )
 
+            carrier_year_totals[carrier][year] = (active_tier, carrier_shipments)
             year_total_shipments += carrier_shipments
             year_total_cost += carrier_cost
 
-        print(
+        lines.append(
             f"\n  {'YEAR TOTAL':<17} {year_total_shipments:>12,.0f} {'':>12} ${year_total_cost:>14,.2f}"
         )
 
     # Summary by destination
-    print("\n" + "-" * 80)
-    print("DESTINATION SUMMARY (All Years)")
-    print("-" * 80)
-    print(
+    lines.append("\n" + "-" * 80)
+    lines.append("DESTINATION SUMMARY (All Years)")
+    lines.append("-" * 80)
+    lines.append(
         f"\n{'Destination':<15} {'Total Shipments':>18} {'Total Target':>18} {'Status':>10}"
     )
-    print(f"{'-' * 15} {'-' * 18} {'-' * 18} {'-' * 10}")
+    lines.append(f"{'-' * 15} {'-' * 18} {'-' * 18} {'-' * 10}")
 
-    for dest in destinations:
-        total_shipments = 0
+    for dest, total_shipments in dest_totals.items():
         total_target = sum(shipment_target[year][dest] for year in range(num_years))
-
-        for year in range(num_years):
-            for carrier in carriers:
-                for tier in range(len(tier_min_quantity)):
-                    var_name = f"ship_y{year}_{carrier}_t{tier}_{dest}"
-                    for var in problem.variables():
-                        if var.name == var_name:
-                            shipments = value(var)
-                            if shipments is not None:
-                                total_shipments += shipments
-                            break
-
         status = "✓" if abs(total_shipments - total_target) < 0.01 else "✗"
-        print(
+        lines.append(
             f"{dest:<15} {total_shipments:>18,.0f} {total_target:>18,.0f} {status:>10}"
         )
 
     # Carrier performance summary
-    print("\n" + "-" * 80)
-    print("CARRIER PERFORMANCE SUMMARY")
-    print("-" * 80)
-    print(
+    lines.append("\n" + "-" * 80)
+    lines.append("CARRIER PERFORMANCE SUMMARY")
+    lines.append("-" * 80)
+    lines.append(
         f"\n{'Carrier':<15} {'Year':<8} {'Tier':<8} {'Shipments':>15} {'Discount':>12}"
     )
-    print(f"{'-' * 15} {'-' * 8} {'-' * 8} {'-' * 15} {'-' * 12}")
+    lines.append(f"{'-' * 15} {'-' * 8} {'-' * 8} {'-' * 15} {'-' * 12}")
 
     for carrier in carriers:
-        for year in range(num_years):
-            # Find active tier
-            active_tier = None
-            for tier in range(len(tier_min_quantity)):
-                tier_var_name = f"tier_y{year}_{carrier}_t{tier}"
-                for var in problem.variables():
-                    if var.name == tier_var_name and value(var) > 0.5:
-                        active_tier = tier
-                        break
-                if active_tier is not None:
-                    break
+        for year, (active_tier, carrier_year_shipments) in enumerate(
+            carrier_year_totals[carrier]
+        ):
+            discount_pct = (1 - discount_rate[carrier][active_tier]) * 100
+            lines.append(
+                f"{carrier:<15} {year:<8} {active_tier:<8} {carrier_year_shipments:>15,.0f} {discount_pct:>11.1f}%"
+            )
 
-            # Calculate total shipments for this carrier/year
-            carrier_year_shipments = 0
-            for dest in destinations:
-                for tier in range(len(tier_min_quantity)):
-                    var_name = f"ship_y{year}_{carrier}_t{tier}_{dest}"
-                    for var in problem.variables():
-                        if var.name == var_name:
-                            shipments = value(var)
-                            if shipments is not None:
-                                carrier_year_shipments += shipments
-                            break
-
-            if active_tier is not None:
-                discount_pct = (1 - discount_rate[carrier][active_tier]) * 100
-                print(
-                    f"{carrier:<15} {year:<8} {active_tier:<8} {carrier_year_shipments:>15,.0f} {discount_pct:>11.1f}%"
-                )
+    lines.append("\n" + "=" * 80 + "\n")
 
-    print("\n" + "=" * 80 + "\n")
+    return lines
+
+
+def print_solution(
+    # solution as returned by get_solution
+    solution: dict,
+    num_years: int,
+    carriers: list[str],
+    destinations: list[str],
+    shipment_target: list[dict[str, float]],
+    tier_min_quantity: list[int],
+    discount_rate: dict[str, list[float]],
+) -> None:
+    """
+    Pretty print the solution of the shipment optimization problem.
+    """
+    lines = format_solution(
+        solution,
+        num_years,
+        carriers,
+        destinations,
+        shipment_target,
+        tier_min_quantity,
+        discount_rate,
+    )
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def get_user_input() -> dict:
@@ -455,12 +644,14 @@ def get_user_input() -> dict:
         ).strip()
         try:
             user_tiers = [int(x) for x in tier_input.split(",") if x.strip()]
-            if all(x > 0 for x in user_tiers):
-                tier_min_quantity = [0] + user_tiers
+            tiers = [0] + user_tiers
+            if all(low < high for low, high in zip(tiers, tiers[1:])):
+                tier_min_quantity = tiers
                 break
             else:
                 print(
-                    "  Error: Tier minimums (other than 0) must be positive integers."
+                    "  Error: Tier minimums (other than 0) must be positive integers "
+                    "in increasing order."
                 )
         except ValueError:
             print("  Error: Please enter valid integers.")
@@ -479,13 +670,13 @@ def get_user_input() -> dict:
                 ).strip()
                 user_rates = [float(x) for x in discount_input.split(",") if x.strip()]
                 if len(user_rates) == len(tier_min_quantity) - 1 and all(
-                    r > 0 for r in user_rates
+                    0 < r <= 1 for r in user_rates
                 ):
                     discount_rate[carrier] = [1.0] + user_rates
                     break
                 else:
                     print(
-                        f"      Error: Provide {len(tier_min_quantity) - 1} positive multipliers "
+                        f"      Error: Provide {len(tier_min_quantity) - 1} multipliers in (0, 1] "
                         f"(one per non-zero tier). Tier 0 (1.0) is added automatically."
                     )
             except ValueError:
@@ -508,14 +699,333 @@ def get_user_input() -> dict:
     }
 
 
-def main():
-    params = get_user_input()
+def is_integer(value) -> bool:
+    """
+    True for an integer read from JSON. bool is an int subclass but not a count.
+    """
+    return isinstance(value, int) and not isinstance(value, bool)
+
 
-    problem = optimize_shipments(**params)
-    problem.solve()
+def is_number(value) -> bool:
+    """
+    True for a finite integer or float read from JSON, excluding bool.
+    """
+    return (
+        isinstance(value, (int, float))
+        and not isinstance(value, bool)
+        and math.isfinite(value)
+    )
+
+
+def load_config(path: str) -> dict:
+    """
+    Load the fixed parameters from a JSON file instead of prompting for them.
+    The file holds the same dict get_user_input returns, Tier 0 included.
+    """
+    with open(path) as f:
+        params = json.load(f)
+
+    if not isinstance(params, dict):
+        raise ValueError(f"{path}: expected a JSON object of parameters")
+    missing = CONFIG_TYPES.keys() - params.keys()
+    if missing:
+        raise ValueError(f"{path}: missing {', '.join(sorted(missing))}")
+    unknown = params.keys() - CONFIG_TYPES.keys()
+    if unknown:
+        raise ValueError(f"{path}: unknown {', '.join(sorted(unknown))}")
+    for key, kind in CONFIG_TYPES.items():
+        if not isinstance(params[key], kind):
+            raise ValueError(f"{path}: {key} must be a {kind.__name__}")
+
+    num_years = params["num_years"]
+    carriers = params["carriers"]
+    destinations = params["destinations"]
+    tier_min_quantity = params["tier_min_quantity"]
+
+    if not is_integer(num_years) or num_years <= 0:
+        raise ValueError(f"{path}: num_years must be a positive integer")
+    for key in ("carriers", "destinations"):
+        names = params[key]
+        if not names or not all(isinstance(name, str) and name for name in names):
+            raise ValueError(f"{path}: {key} must be a non-empty list of names")
+        if len(set(names)) != len(names):
+            raise ValueError(f"{path}: {key} must not repeat a name")
+    if not tier_min_quantity or tier_min_quantity[0] != 0:
+        raise ValueError(f"{path}: tier_min_quantity must start with Tier 0 (0)")
+    if not all(is_integer(tier) for tier in tier_min_quantity) or any(
+        low >= high for low, high in zip(tier_min_quantity, tier_min_quantity[1:])
+    ):
+        raise ValueError(
+            f"{path}: tier_min_quantity must be strictly increasing integers"
+        )
+    dest_set = set(destinations)
+    n_tiers = len(tier_min_quantity)
+
+    # the same checks get_user_input makes on each value it reads
+    if len(params["shipment_target"]) != num_years:
+        raise ValueError(f"{path}: shipment_target needs one entry per year")
+    for year, yearly_targets in enumerate(params["shipment_target"]):
+        if not isinstance(yearly_targets, dict):
+            raise ValueError(f"{path}: shipment_target for year {year} must be a dict")
+        if set(yearly_targets) != dest_set:
+            raise ValueError(
+                f"{path}: shipment_target for year {year} needs every destination"
+            )
+        if not all(is_integer(val) and val >= 0 for val in yearly_targets.values()):
+            raise ValueError(
+                f"{path}: shipment_target for year {year} must be non-negative "
+                "integers"
+            )
+    for key in ("shipment_cost", "discount_rate"):
+        if set(params[key]) != set(carriers):
+            raise ValueError(f"{path}: {key} needs exactly one entry per carrier")
+    for carrier in carriers:
+        carrier_costs = params["shipment_cost"][carrier]
+        if not isinstance(carrier_costs, dict) or set(carrier_costs) != dest_set:
+            raise ValueError(
+                f"{path}: shipment_cost for '{carrier}' needs every destination"
+            )
+        if not all(is_number(val) and val >= 0 for val in carrier_costs.values()):
+            raise ValueError(
+                f"{path}: shipment_cost for '{carrier}' must be non-negative numbers"
+            )
+        carrier_rates = params["discount_rate"][carrier]
+        if not isinstance(carrier_rates, list) or len(carrier_rates) != n_tiers:
+            raise ValueError(
+                f"{path}: discount_rate for '{carrier}' needs one multiplier per tier"
+            )
+        if not all(is_number(rate) and 0 < rate <= 1 for rate in carrier_rates) or (
+            carrier_rates[0] != 1
+        ):
+            raise ValueError(
+                f"{path}: discount_rate for '{carrier}' must be multipliers in "
+                "(0, 1], starting with Tier 0 (1.0)"
+            )
+
+    return params
+
+
+def save_config(params: dict, path: str) -> None:
+    """
+    Save the fixed parameters in the format load_config reads.
+    """
+    with open(path, "w") as f:
+        json.dump(params, f, indent=2)
+
+
+def get_solver(name: str | None = None, warm_start: bool = False) -> LpSolver:
+    """
+    Return the solver for the carrier model by name (one of SOLVERS).
+    Without a name HiGHS is used when its binary is installed, otherwise the
+    bundled CBC runs quietly with presolve, cuts, CBC_OPTIONS and one thread
+    per CPU.
+    """
+    if name is not None and name not in SOLVERS:
+        raise ValueError(f"Unknown solver '{name}', expected one of {SOLVERS}")
+
+    threads = os.cpu_count()
+    if name == "scip":
+        return SCIP_CMD(msg=False, threads=threads)
+    if name == "gurobi":
+        return GUROBI_CMD(msg=False, threads=threads, warmStart=warm_start)
+    if name == "cuopt":
+        # NVIDIA cuOpt solves on the GPU, so there is no thread count to pass
+        return CUOPT(msg=False, warmStart=warm_start)
+
+    highs = HiGHS_CMD(msg=False, threads=threads, warmStart=warm_start)
+    if name == "highs" or (name is None and highs.available()):
+        return highs
+    return PULP_CBC_CMD(
+        msg=False,
+        threads=threads,
+        presolve=True,
+        cuts=True,
+        warmStart=warm_start,
+        options=CBC_OPTIONS,
+    )
+
+
+def warm_start_signature(params: dict) -> list:
+    """
+    Return what a saved solution must match to be used as a MIP start.
+    Variables are named by position, so a start saved for another set of
+    years, carriers, destinations or tiers would assign values to unrelated
+    variables.
+    """
+    return [
+        params["num_years"],
+        params["carriers"],
+        params["destinations"],
+        len(params["tier_min_quantity"]),
+    ]
+
+
+def load_warm_start(
+    problem: LpProblem, params: dict, path: str = WARM_START_PATH
+) -> bool:
+    """
+    Set initial values from a previously saved solution for the same model
+    shape. Saved values outside the new bounds (e.g. after lowering a target)
+    are skipped. Returns True if a saved solution was found and applied.
+    """
+    if not os.path.exists(path):
+        return False
+
+    with open(path) as f:
+        saved = json.load(f)
+    if saved.get("signature") != warm_start_signature(params):
+        return False
+
+    values = saved["values"]
+    for var in problem.variables():
+        if values.get(var.name) is not None:
+            var.setInitialValue(values[var.name], check=False)
+    return True
+
+
+def save_warm_start(
+    problem: LpProblem, params: dict, path: str = WARM_START_PATH
+) -> None:
+    """
+    Save the solved variable values for use as the next run's MIP start.
+    """
+    with open(path, "w") as f:
+        json.dump(
+            {
+                "signature": warm_start_signature(params),
+                "values": {var.name: var.varValue for var in problem.variables()},
+            },
+            f,
+        )
+
+
+def solution_cache_path(params: dict, cache_dir: str = SOLUTION_CACHE_DIR) -> str:
+    """
+    Return the cache file for a set of input parameters.
+    """
+    key = json.dumps([SOLUTION_CACHE_VERSION, params], sort_keys=True)
+    digest = hashlib.sha256(key.encode()).hexdigest()
+    return os.path.join(cache_dir, f"{digest}.json")
+
+
+def load_cached_solution(
+    params: dict, cache_dir: str = SOLUTION_CACHE_DIR
+) -> dict | None:
+    """
+    Return the cached solution for these parameters, or None if not cached.
+    """
+    path = solution_cache_path(params, cache_dir)
+    if not os.path.exists(path):
+        return None
+
+    with open(path) as f:
+        cached = json.load(f)
+
+    # JSON has no tuple keys, so shipments are stored as [*key, value] rows
+    cached["shipments"] = {
+        (year, carrier, dest): shipments
+        for year, carrier, dest, shipments in cached["shipments"]
+    }
+    # and tier numbers, as object keys, come back as strings
+    cached["tiers"] = [
+        {
+            carrier: {int(tier): flag for tier, flag in flags.items()}
+            for carrier, flags in year_flags.items()
+        }
+        for year_flags in cached["tiers"]
+    ]
+    return cached
+
+
+def save_cached_solution(
+    params: dict, solution: dict, cache_dir: str = SOLUTION_CACHE_DIR
+) -> None:
+    """
+    Save a solution so later runs with the same parameters skip the solve.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(solution_cache_path(params, cache_dir), "w") as f:
+        json.dump(
+            {
+                **solution,
+                "shipments": [
+                    [*key, shipments]
+                    for key, shipments in solution["shipments"].items()
+                ],
+            },
+            f,
+        )
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """
+    Parse command line options for the carrier earned discount optimization.
+    """
+    parser = argparse.ArgumentParser(
+        description="Optimize multi-year carrier shipments for earned discounts."
+    )
+    parser.add_argument(
+        "--solver",
+        choices=SOLVERS,
+        default=os.environ.get("CARRIER_SOLVER") or None,
+        help="solver backend (default: $CARRIER_SOLVER, else HiGHS if installed, "
+        "else CBC)",
+    )
+    parser.add_argument(
+        "--config",
+        metavar="PATH",
+        help="read the parameters from a JSON file instead of prompting",
+    )
+    parser.add_argument(
+        "--dump-config",
+        metavar="PATH",
+        help="save the parameters to a JSON file usable with --config",
+    )
+    args = parser.parse_args(argv)
+    # argparse checks choices for --solver only, not for the default it takes
+    # from the environment
+    if args.solver is not None and args.solver not in SOLVERS:
+        parser.error(
+            f"CARRIER_SOLVER: invalid choice: '{args.solver}' "
+            f"(choose from {', '.join(SOLVERS)})"
+        )
+    return args
+
+
+def main():
+    args = parse_args()
+    if args.config:
+        try:
+            params = load_config(args.config)
+        except (OSError, ValueError) as e:
+            sys.exit(f"Error: {e}")
+    else:
+        params = get_user_input()
+    if args.dump_config:
+        save_config(params, args.dump_config)
+
+    # the model is only built and solved when these parameters are not cached
+    # and there is more than one carrier to choose between
+    solution = load_cached_solution(params)
+    if solution is None and len(params["carriers"]) == 1:
+        solution = solve_single_carrier(**params)
+    if solution is None:
+        problem, shipments, tier_flag = optimize_shipments(**params)
+        warm_start = load_warm_start(problem, params)
+        solver = get_solver(args.solver, warm_start)
+        if not solver.available():
+            sys.exit(
+                f"Error: solver '{args.solver}' is not installed; install it or "
+                "choose another with --solver"
+            )
+        problem.solve(solver)
+        solution = get_solution(problem, shipments, tier_flag)
+        if problem.status == LpStatusOptimal:
+            save_warm_start(problem, params)
+            save_cached_solution(params, solution)
 
     print_solution(
-        problem,
+        solution,
         params["num_years"],
         params["carriers"],
         params["destinations"],
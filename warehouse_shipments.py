@@ -1,6 +1,32 @@
+import argparse
+import json
+import math
+import os
+import sys
 from typing import Dict
 import pulp
 
+# Solver names accepted by get_solver and --solver
+SOLVERS = ("cbc", "highs", "glpk")
+
+# The solver stops once the best solution is within this fraction of the bound,
+# or after this many seconds; both can be changed with --gap and --time-limit
+DEFAULT_GAP = 0.01
+DEFAULT_TIME_LIMIT = 600
+
+# keys of the parameter dict, as read from a --config file
+PARAM_KEYS = {
+    "warehouses",
+    "destinations",
+    "target_distribution",
+    "shipment_capacity",
+    "warehouse_cost",
+    "shipment_cost",
+    "target_delivery_days",
+    "delivery_tolerance",
+    "delivery_estimate",
+}
+
 
 def optimize_shipments(
     warehouses: list[str],
@@ -12,79 +38,250 @@ def optimize_shipments(
     target_delivery_days: int,
     delivery_tolerance: float,
     delivery_estimate: Dict[str, Dict[str, int]],
-) -> pulp.LpProblem:
+) -> tuple[
+    pulp.LpProblem,
+    Dict[tuple[str, str], pulp.LpVariable],
+    Dict[str, pulp.LpVariable],
+]:
     problem = pulp.LpProblem("Shipment_Optimization", pulp.LpMinimize)
 
+    # Delivery target coefficients, see the delivery target constraints below
+    late_coef = 1 - delivery_tolerance
+    on_time_coef = -delivery_tolerance
+
+    # Lane parameters by position, *_rows[wi][dj] for warehouses[wi] and
+    # destinations[dj], read once from the nested dicts and shared by the
+    # variable, usage and symmetry loops below
+    capacity_rows = [
+        [shipment_capacity[i][j] for j in destinations] for i in warehouses
+    ]
+    cost_rows = [[shipment_cost[i][j] for j in destinations] for i in warehouses]
+    estimate_rows = [
+        [delivery_estimate[i][j] for j in destinations] for i in warehouses
+    ]
+
     # DECISION VARIABLES
-    shipment_count = {
-        (i, j): pulp.LpVariable(
-            f"shipment_count_{i}_{j}",
-            lowBound=0,
-            upBound=shipment_capacity[i][j],
-            cat="Integer",
-        )
-        for i in warehouses
-        for j in destinations
-    }
+    # Created in one pass over the lanes, which also gathers the objective terms
+    # and each warehouse's and destination's row terms. Lanes without capacity
+    # can carry nothing and get no variable. Variables are named by position,
+    # s_{wi}_{dj} and u_{wi}, as are the constraints below, which keeps names
+    # short and unique whatever the warehouse and destination names contain
+    # (PuLP turns characters such as spaces into '_').
+    shipment_count = {}
+    cost_terms = []
+    # warehouse_vars[i] == shipment variables out of i, to every destination
+    warehouse_vars = {i: [] for i in warehouses}
+    # dest_vars[j] == shipment variables into j, from every warehouse
+    dest_vars = {j: [] for j in destinations}
+    # delivery_terms[j] == (variable, coefficient) pairs of j's delivery row
+    delivery_terms = {j: [] for j in destinations}
+    for wi, (i, capacity_row, cost_row, estimate_row) in enumerate(
+        zip(warehouses, capacity_rows, cost_rows, estimate_rows)
+    ):
+        for dj, (j, capacity, cost, estimate) in enumerate(
+            zip(destinations, capacity_row, cost_row, estimate_row)
+        ):
+            if capacity <= 0:
+                continue
+            var = pulp.LpVariable(
+                f"s_{wi}_{dj}", lowBound=0, upBound=capacity, cat=pulp.LpInteger
+            )
+            shipment_count[(i, j)] = var
+            cost_terms.append((var, cost))
+            warehouse_vars[i].append(var)
+            dest_vars[j].append(var)
 
-    # warehouse_usage[i] = binary variable indicating if warehouse i is used
-    warehouse_usage = pulp.LpVariable.dicts("warehouse_usage", warehouses, cat="Binary")
+            coef = late_coef if estimate > target_delivery_days else on_time_coef
+            # zero coefficients (tolerance 0 or 1) add nonzeros but no restriction
+            if coef:
+                delivery_terms[j].append((var, coef))
 
-    # CALCULATED PARAMETERS
-    delivery_target_failure = {
-        (i, j): 1 if delivery_estimate[i][j] > target_delivery_days else 0
-        for i in warehouses
-        for j in destinations
+    # warehouse_usage[i] = binary variable indicating if warehouse i is used
+    warehouse_usage = {
+        i: pulp.LpVariable(f"u_{wi}", cat=pulp.LpBinary)
+        for wi, i in enumerate(warehouses)
     }
 
     # OBJECTIVE FUNCTION
-    total_cost = pulp.lpSum(
-        [
-            shipment_count[(i, j)] * shipment_cost[i][j]
-            for i in warehouses
-            for j in destinations
-        ]
-    ) + pulp.lpSum([warehouse_usage[i] * warehouse_cost[i] for i in warehouses])
+    # built straight from (variable, coefficient) pairs in a single expression
+    total_cost = pulp.LpAffineExpression(
+        cost_terms + [(warehouse_usage[i], warehouse_cost[i]) for i in warehouses]
+    )
     problem += total_cost, "Total_Cost"
 
     # CONSTRAINTS
+    # named by warehouse position wi or destination position dj
     # Warehouse usage constraints
-    for i in warehouses:
-        for j in destinations:
-            problem += (
-                shipment_count[(i, j)] <= shipment_capacity[i][j] * warehouse_usage[i],
-                f"Warehouse_Usage_{i}_{j}",
+    # one row per warehouse: its shipments <= its total capacity * usage. The
+    # per-lane capacities are already the shipment variables' upper bounds.
+    for wi, (i, capacity_row) in enumerate(zip(warehouses, capacity_rows)):
+        total_capacity = sum(capacity_row)
+        problem += pulp.LpConstraint(
+            pulp.LpAffineExpression(
+                [(var, 1) for var in warehouse_vars[i]]
+                + [(warehouse_usage[i], -total_capacity)]
+            ),
+            sense=pulp.LpConstraintLE,
+            name=f"Warehouse_Usage_{wi}",
+            rhs=0,
+        )
+
+    # Symmetry breaking: warehouses with identical costs, capacities and
+    # delivery estimates are interchangeable, so any solution can be reordered
+    # to use them first-to-last; requiring that prunes equivalent branches.
+    # identical_warehouses[signature] == positions of the warehouses sharing it
+    identical_warehouses = {}
+    for wi, (i, capacity_row, cost_row, estimate_row) in enumerate(
+        zip(warehouses, capacity_rows, cost_rows, estimate_rows)
+    ):
+        signature = (
+            warehouse_cost[i],
+            tuple(cost_row),
+            tuple(capacity_row),
+            tuple(estimate_row),
+        )
+        identical_warehouses.setdefault(signature, []).append(wi)
+
+    for group in identical_warehouses.values():
+        for wi, next_wi in zip(group, group[1:]):
+            problem += pulp.LpConstraint(
+                pulp.LpAffineExpression(
+                    [
+                        (warehouse_usage[warehouses[wi]], 1),
+                        (warehouse_usage[warehouses[next_wi]], -1),
+                    ]
+                ),
+                sense=pulp.LpConstraintGE,
+                name=f"Symmetry_{wi}_{next_wi}",
+                rhs=0,
             )
 
     # Distribution constraints
-    for j in destinations:
-        problem += (
-            pulp.lpSum([shipment_count[(i, j)] for i in warehouses])
-            == target_distribution[j],
-            f"Distribution_{j}",
+    for dj, j in enumerate(destinations):
+        problem += pulp.LpConstraint(
+            pulp.LpAffineExpression([(var, 1) for var in dest_vars[j]]),
+            sense=pulp.LpConstraintEQ,
+            name=f"Distribution_{dj}",
+            rhs=target_distribution[j],
         )
 
     # Delivery target constraints
+    # failed shipments <= delivery_tolerance * total shipments to j, with every
+    # term moved to the left-hand side as one coefficient per shipment variable:
+    # 1 - delivery_tolerance if the lane misses the target, else -delivery_tolerance
+    for dj, j in enumerate(destinations):
+        # a row without terms holds trivially
+        if delivery_terms[j]:
+            problem += pulp.LpConstraint(
+                pulp.LpAffineExpression(delivery_terms[j]),
+                sense=pulp.LpConstraintLE,
+                name=f"Delivery_Target_{dj}",
+                rhs=0,
+            )
+
+    return problem, shipment_count, warehouse_usage
+
+
+def greedy_shipments(
+    warehouses: list[str],
+    destinations: list[str],
+    target_distribution: Dict[str, int],
+    shipment_capacity: Dict[str, Dict[str, int]],
+    shipment_cost: Dict[str, Dict[str, float]],
+    target_delivery_days: int,
+    delivery_tolerance: float,
+    delivery_estimate: Dict[str, Dict[str, int]],
+) -> Dict[tuple[str, str], int] | None:
+    """
+    Build a cheap feasible plan to start the solver from. Each destination's
+    target is filled from its cheapest lanes, or from its on-time lanes first
+    if the cheapest ones would miss the delivery target. Returns None if a
+    destination cannot be filled within its lane capacities and delivery target.
+    """
+    plan = {}
     for j in destinations:
-        failed_shipments = pulp.lpSum(
-            [
-                delivery_target_failure[(i, j)] * shipment_count[(i, j)]
-                for i in warehouses
-            ]
-        )
+        target = target_distribution[j]
+        # (cost, misses delivery target, position, warehouse) for every lane
+        # with capacity; ties go to the earlier warehouse, so identical
+        # warehouses are opened in the order the Symmetry rows require
+        lanes = [
+            (
+                shipment_cost[i][j],
+                delivery_estimate[i][j] > target_delivery_days,
+                wi,
+                i,
+            )
+            for wi, i in enumerate(warehouses)
+            if shipment_capacity[i][j] > 0
+        ]
+        for order in (
+            sorted(lanes),
+            sorted(lanes, key=lambda lane: (lane[1], lane[0], lane[2])),
+        ):
+            fill = {}
+            remaining = target
+            late = 0
+            for _, is_late, _, i in order:
+                count = min(shipment_capacity[i][j], remaining)
+                fill[(i, j)] = count
+                remaining -= count
+                if is_late:
+                    late += count
+            if remaining == 0 and late <= delivery_tolerance * target:
+                break
+        else:
+            return None
+        plan.update(fill)
 
-        total_to_dest = pulp.lpSum([shipment_count[(i, j)] for i in warehouses])
+    return plan
 
-        problem += (
-            failed_shipments <= delivery_tolerance * total_to_dest,
-            f"Delivery_Target_{j}",
-        )
 
-    return problem
+def set_initial_values(
+    shipment_count: Dict[tuple[str, str], pulp.LpVariable],
+    warehouse_usage: Dict[str, pulp.LpVariable],
+    plan: Dict[tuple[str, str], int],
+) -> None:
+    """
+    Set the plan from greedy_shipments as the variables' initial values, for
+    a solver created with warm_start.
+    """
+    used = {i for (i, _), count in plan.items() if count > 0}
+    for lane, count in plan.items():
+        shipment_count[lane].setInitialValue(count)
+    for i, var in warehouse_usage.items():
+        var.setInitialValue(1 if i in used else 0)
 
 
-def print_solution(
+def get_solution(
     problem: pulp.LpProblem,
+    # variables as returned by optimize_shipments, no shipment_count for lanes
+    # without capacity
+    shipment_count: Dict[tuple[str, str], pulp.LpVariable],
+    warehouse_usage: Dict[str, pulp.LpVariable],
+) -> dict:
+    """
+    Return the solved warehouse model as plain data for format_solution: its
+    status, solution status and objective, the whole shipment count of each
+    lane with capacity and whether each warehouse is used.
+    """
+    return {
+        "status": problem.status,
+        # LpSolutionIntegerFeasible if the solver stopped (at its time limit)
+        # with a solution it had not proven optimal
+        "sol_status": problem.sol_status,
+        "objective": pulp.value(problem.objective),
+        # shipments[(warehouse, destination)] == shipments, lanes with capacity only
+        "shipments": {
+            lane: round(var.varValue or 0) for lane, var in shipment_count.items()
+        },
+        # usage[warehouse] == 1 if the warehouse is used, else 0
+        "usage": {i: round(var.varValue or 0) for i, var in warehouse_usage.items()},
+    }
+
+
+def format_solution(
+    # solution as returned by get_solution
+    solution: dict,
     warehouses: list[str],
     destinations: list[str],
     target_distribution: Dict[str, int],
@@ -92,194 +289,215 @@ def print_solution(
     shipment_cost: Dict[str, Dict[str, float]],
     target_delivery_days: int,
     delivery_estimate: Dict[str, Dict[str, int]],
-) -> None:
+) -> list[str]:
     """
-    Pretty print the solution of the shipment optimization problem.
+    Format the solution of the shipment optimization problem as report lines.
     """
-    print("\n" + "=" * 80)
-    print("WAREHOUSE SHIPMENT OPTIMIZATION RESULTS")
-    print("=" * 80)
+    lines = []
+    lines.append("\n" + "=" * 80)
+    lines.append("WAREHOUSE SHIPMENT OPTIMIZATION RESULTS")
+    lines.append("=" * 80)
 
-    status_code = problem.status
+    status_code = solution["status"]
     status_name = pulp.LpStatus[status_code]
-    print(f"\nSolver Status: {status_name} (code: {status_code})")
+    # stopped early with an incumbent: PuLP reports the status as Optimal
+    not_proven = solution["sol_status"] == pulp.LpSolutionIntegerFeasible
+    if not_proven:
+        status_name = pulp.LpSolution[solution["sol_status"]]
+    lines.append(f"\nSolver Status: {status_name} (code: {status_code})")
 
     # Handle different solver statuses
     if status_code == pulp.LpStatusOptimal:
-        print(f"Optimal Total Cost: ${problem.objective.value():,.2f}\n")
+        if not_proven:
+            lines.append(
+                "Best Found Total Cost (not proven optimal): "
+                f"${solution['objective']:,.2f}\n"
+            )
+        else:
+            lines.append(f"Optimal Total Cost: ${solution['objective']:,.2f}\n")
 
     elif status_code == pulp.LpStatusInfeasible:
-        print("\n⚠ PROBLEM IS INFEASIBLE ⚠")
-        print("\nThe constraints cannot be satisfied simultaneously.")
-        print("\nPossible reasons:")
-        print("  1. Destination shipment targets exceed total warehouse capacity.")
-        print("  2. Some individual warehouse–destination capacity is too small.")
-        print("  3. Delivery tolerance too strict relative to delivery estimates.")
-        print("  4. Conflicting constraints between capacities and targets.\n")
-
-        print("Diagnostic Information:")
-        print(f"  Total shipments required: {sum(target_distribution.values()):,}")
-        print(f"  Number of warehouses: {len(warehouses)}")
-        print(f"  Number of destinations: {len(destinations)}")
-        print(f"  Target delivery days: {target_delivery_days}")
-
-        print("\n  Warehouse capacities summary:")
+        lines.append("\n⚠ PROBLEM IS INFEASIBLE ⚠")
+        lines.append("\nThe constraints cannot be satisfied simultaneously.")
+        lines.append("\nPossible reasons:")
+        lines.append(
+            "  1. Destination shipment targets exceed total warehouse capacity."
+        )
+        lines.append(
+            "  2. Some individual warehouse–destination capacity is too small."
+        )
+        lines.append(
+            "  3. Delivery tolerance too strict relative to delivery estimates."
+        )
+        lines.append("  4. Conflicting constraints between capacities and targets.\n")
+
+        lines.append("Diagnostic Information:")
+        lines.append(
+            f"  Total shipments required: {sum(target_distribution.values()):,}"
+        )
+        lines.append(f"  Number of warehouses: {len(warehouses)}")
+        lines.append(f"  Number of destinations: {len(destinations)}")
+        lines.append(f"  Target delivery days: {target_delivery_days}")
+
+        lines.append("\n  Warehouse capacities summary:")
         for i in warehouses:
-            total_cap = sum(delivery_estimate[i][j] for j in destinations)
-            print(
-                f"    {i}: max total {sum(cap for cap in total_cap if cap)} (est. days sum)"
-            )
+            total_days = sum(delivery_estimate[i][j] for j in destinations)
+            lines.append(f"    {i}: max total {total_days} (est. days sum)")
 
-        print("\n  Delivery tolerance may also affect feasibility if too low.")
-        print("\nSuggestions:")
-        print("  • Verify each destination's target can be met by available capacity.")
-        print("  • Increase delivery_tolerance or relax tight delivery constraints.")
-        print("  • Check for typos in input numbers (e.g., 0 where it shouldn’t be).")
-        print("  • Try a smaller number of destinations or simplify constraints.")
-        return
+        lines.append("\n  Delivery tolerance may also affect feasibility if too low.")
+        lines.append("\nSuggestions:")
+        lines.append(
+            "  • Verify each destination's target can be met by available capacity."
+        )
+        lines.append(
+            "  • Increase delivery_tolerance or relax tight delivery constraints."
+        )
+        lines.append(
+            "  • Check for typos in input numbers (e.g., 0 where it shouldn’t be)."
+        )
+        lines.append(
+            "  • Try a smaller number of destinations or simplify constraints."
+        )
+        return lines
 
     elif status_code == pulp.LpStatusUnbounded:
-        print("\n⚠ PROBLEM IS UNBOUNDED ⚠")
-        print("\nThe objective function can be improved indefinitely.")
-        print("This usually means missing constraints, such as:")
-        print("  • Missing capacity limits or non-negative bounds.")
-        print("  • Incorrect cost signs (e.g., negative costs).")
-        print("  • A constraint typo that allows unlimited shipments.\n")
-        return
+        lines.append("\n⚠ PROBLEM IS UNBOUNDED ⚠")
+        lines.append("\nThe objective function can be improved indefinitely.")
+        lines.append("This usually means missing constraints, such as:")
+        lines.append("  • Missing capacity limits or non-negative bounds.")
+        lines.append("  • Incorrect cost signs (e.g., negative costs).")
+        lines.append("  • A constraint typo that allows unlimited shipments.\n")
+        return lines
 
     elif status_code == pulp.LpStatusNotSolved:
-        print("\n⚠ PROBLEM NOT SOLVED ⚠")
-        print("\nThe solver did not attempt to solve or did not complete.")
-        print("Possible reasons:")
-        print("  • Solver not installed or misconfigured.")
-        print("  • Problem too large for available memory or time.")
-        print("  • Timeout reached before solution found.\n")
-        return
+        lines.append("\n⚠ PROBLEM NOT SOLVED ⚠")
+        lines.append("\nThe solver did not attempt to solve or did not complete.")
+        lines.append("Possible reasons:")
+        lines.append("  • Solver not installed or misconfigured.")
+        lines.append("  • Problem too large for available memory or time.")
+        lines.append("  • Timeout reached before solution found.\n")
+        return lines
 
     elif status_code == -3:
-        print("\n⚠ SOLVER RETURNED UNDEFINED STATUS ⚠")
-        print("\nThe solver encountered an issue such as:")
-        print("  • Numerical instability or infeasibility.")
-        print("  • Model formulation issues or missing bounds.")
-        print("  • Internal solver error.\n")
-        return
+        lines.append("\n⚠ SOLVER RETURNED UNDEFINED STATUS ⚠")
+        lines.append("\nThe solver encountered an issue such as:")
+        lines.append("  • Numerical instability or infeasibility.")
+        lines.append("  • Model formulation issues or missing bounds.")
+        lines.append("  • Internal solver error.\n")
+        return lines
 
     # If optimal, proceed with detailed reporting
-    print("=" * 80)
-    print("OPTIMAL SOLUTION DETAILS")
-    print("=" * 80)
-
-    # Extract solution values
-    shipment_counts = {}
-    warehouse_usage = {}
+    lines.append("=" * 80)
+    if not_proven:
+        lines.append("BEST FOUND SOLUTION DETAILS")
+    else:
+        lines.append("OPTIMAL SOLUTION DETAILS")
+    lines.append("=" * 80)
 
-    for v in problem.variables():
-        if v.name.startswith("shipment_count_"):
-            # Parse warehouse and destination from variable name
-            parts = v.name.replace("shipment_count_", "").split("_")
-            i, j = parts[0], parts[1]
-            shipment_counts[(i, j)] = int(v.varValue)
-        elif v.name.startswith("warehouse_usage_"):
-            i = v.name.replace("warehouse_usage_", "")
-            warehouse_usage[i] = int(v.varValue)
+    usage_values = solution["usage"]
+    shipments = solution["shipments"]
 
     # Calculate total shipments across all destination targets
     total_shipments = sum(target_distribution.values())
 
+    # Every total below is gathered in a single pass over the lanes, by position
+    # warehouse_totals[wi] == shipments from warehouses[wi]
+    warehouse_totals = [0] * len(warehouses)
+    # dest_*[dj] == shipments, shipment-days and on-time shipments to destinations[dj]
+    dest_actual = [0] * len(destinations)
+    dest_delivery_days = [0] * len(destinations)
+    dest_on_time = [0] * len(destinations)
+    # routes == (warehouse, destination, shipments, unit cost) of every used lane
+    routes = []
+    for wi, i in enumerate(warehouses):
+        cost_i = shipment_cost[i]
+        estimate_i = delivery_estimate[i]
+        for dj, j in enumerate(destinations):
+            count = shipments.get((i, j), 0)
+            if count > 0:
+                days = estimate_i[j]
+                warehouse_totals[wi] += count
+                dest_actual[dj] += count
+                dest_delivery_days[dj] += count * days
+                if days <= target_delivery_days:
+                    dest_on_time[dj] += count
+                routes.append((i, j, count, cost_i[j]))
+
     # Print warehouse usage and costs
-    print("WAREHOUSE USAGE:")
-    print("-" * 80)
+    lines.append("WAREHOUSE USAGE:")
+    lines.append("-" * 80)
     fixed_cost_total = 0
     for i in warehouses:
-        status = "ACTIVE" if warehouse_usage.get(i, 0) == 1 else "INACTIVE"
-        cost = warehouse_cost[i] * warehouse_usage.get(i, 0)
+        status = "ACTIVE" if usage_values[i] == 1 else "INACTIVE"
+        cost = warehouse_cost[i] * usage_values[i]
         fixed_cost_total += cost
-        print(f"  Warehouse {i}: {status:8s}  Fixed Cost: ${cost:,.2f}")
-    print(f"  Total Fixed Costs: ${fixed_cost_total:,.2f}\n")
+        lines.append(f"  Warehouse {i}: {status:8s}  Fixed Cost: ${cost:,.2f}")
+    lines.append(f"  Total Fixed Costs: ${fixed_cost_total:,.2f}\n")
 
     # Print shipment routing table
-    print("SHIPMENT ROUTING:")
-    print("-" * 80)
+    lines.append("SHIPMENT ROUTING:")
+    lines.append("-" * 80)
 
     # Header
     header = f"  {'From':8s} -> {'To':8s} | {'Shipments':>10s} | {'Unit Cost':>10s} | {'Total Cost':>12s}"
-    print(header)
-    print("  " + "-" * 76)
+    lines.append(header)
+    lines.append("  " + "-" * 76)
 
     variable_cost_total = 0
-    for i in warehouses:
-        for j in destinations:
-            count = shipment_counts.get((i, j), 0)
-            if count > 0:
-                unit_cost = shipment_cost[i][j]
-                total_cost = count * unit_cost
-                variable_cost_total += total_cost
-                print(
-                    f"  {i:8s} -> {j:8s} | {count:10d} | ${unit_cost:9.2f} | ${total_cost:11.2f}"
-                )
+    for i, j, count, unit_cost in routes:
+        total_cost = count * unit_cost
+        variable_cost_total += total_cost
+        lines.append(
+            f"  {i:8s} -> {j:8s} | {count:10d} | ${unit_cost:9.2f} | ${total_cost:11.2f}"
+        )
 
-    print("  " + "-" * 76)
-    print(f"  {'Total Variable Costs:':32s} ${variable_cost_total:11,.2f}\n")
+    lines.append("  " + "-" * 76)
+    lines.append(f"  {'Total Variable Costs:':32s} ${variable_cost_total:11,.2f}\n")
 
     # Print destination distribution
-    print("DESTINATION DISTRIBUTION:")
-    print("-" * 80)
-    print(
+    lines.append("DESTINATION DISTRIBUTION:")
+    lines.append("-" * 80)
+    lines.append(
         f"  {'Destination':12s} | {'Actual':>10s} | {'Target':>10s} | {'% of Total':>11s}"
     )
-    print("  " + "-" * 76)
+    lines.append("  " + "-" * 76)
 
-    for j in destinations:
-        dest_actual = sum(shipment_counts.get((i, j), 0) for i in warehouses)
+    for j, actual in zip(destinations, dest_actual):
         dest_target = target_distribution.get(j, 0)
-        pct_of_total = (
-            (dest_actual / total_shipments) * 100 if total_shipments > 0 else 0
-        )
-        print(
-            f"  {j:12s} | {dest_actual:10d} | {dest_target:10d} | {pct_of_total:10.2f}%"
+        pct_of_total = (actual / total_shipments) * 100 if total_shipments > 0 else 0
+        lines.append(
+            f"  {j:12s} | {actual:10d} | {dest_target:10d} | {pct_of_total:10.2f}%"
         )
 
-    print("  " + "-" * 76)
-    print(
+    lines.append("  " + "-" * 76)
+    lines.append(
         f"  {'TOTAL':12s} | {total_shipments:10d} | {total_shipments:10d} | {100.0:10.2f}%\n"
     )
 
     # Print warehouse distribution
-    print("WAREHOUSE DISTRIBUTION:")
-    print("-" * 80)
-    print(f"  {'Warehouse':12s} | {'Shipments':>10s} | {'% of Total':>11s}")
-    print("  " + "-" * 76)
+    lines.append("WAREHOUSE DISTRIBUTION:")
+    lines.append("-" * 80)
+    lines.append(f"  {'Warehouse':12s} | {'Shipments':>10s} | {'% of Total':>11s}")
+    lines.append("  " + "-" * 76)
 
-    for i in warehouses:
-        warehouse_total = sum(shipment_counts.get((i, j), 0) for j in destinations)
+    for i, warehouse_total in zip(warehouses, warehouse_totals):
         pct_of_total = (
             (warehouse_total / total_shipments) * 100 if total_shipments > 0 else 0
         )
-        print(f"  {i:12s} | {warehouse_total:10d} | {pct_of_total:10.2f}%")
+        lines.append(f"  {i:12s} | {warehouse_total:10d} | {pct_of_total:10.2f}%")
 
-    print("  " + "-" * 76)
-    print(f"  {'TOTAL':12s} | {total_shipments:10d} | {100.0:10.2f}%\n")
+    lines.append("  " + "-" * 76)
+    lines.append(f"  {'TOTAL':12s} | {total_shipments:10d} | {100.0:10.2f}%\n")
 
     # Print delivery time statistics
-    print("DELIVERY TIME STATISTICS:")
-    print("-" * 80)
-    print(f"  Target Delivery Days: {target_delivery_days}\n")
+    lines.append("DELIVERY TIME STATISTICS:")
+    lines.append("-" * 80)
+    lines.append(f"  Target Delivery Days: {target_delivery_days}\n")
 
     # Overall statistics
-    total_delivery_days = 0
-    on_time_shipments = 0
-    late_shipments = 0
-
-    for i in warehouses:
-        for j in destinations:
-            count = shipment_counts.get((i, j), 0)
-            if count > 0:
-                days = delivery_estimate[i][j]
-                total_delivery_days += days * count
-                if days <= target_delivery_days:
-                    on_time_shipments += count
-                else:
-                    late_shipments += count
+    total_delivery_days = sum(dest_delivery_days)
+    on_time_shipments = sum(dest_on_time)
+    late_shipments = sum(dest_actual) - on_time_shipments
 
     avg_delivery_days = (
         total_delivery_days / total_shipments if total_shipments > 0 else 0
@@ -289,39 +507,81 @@ def print_solution(
     )
     late_pct = (late_shipments / total_shipments * 100) if total_shipments > 0 else 0
 
-    print("  Overall:")
-    print(f"    Average Delivery Time: {avg_delivery_days:.2f} days")
-    print(f"    On-Time Shipments:     {on_time_shipments:,} ({on_time_pct:.2f}%)")
-    print(f"    Late Shipments:        {late_shipments:,} ({late_pct:.2f}%)\n")
+    lines.append("  Overall:")
+    lines.append(f"    Average Delivery Time: {avg_delivery_days:.2f} days")
+    lines.append(
+        f"    On-Time Shipments:     {on_time_shipments:,} ({on_time_pct:.2f}%)"
+    )
+    lines.append(f"    Late Shipments:        {late_shipments:,} ({late_pct:.2f}%)\n")
 
     # Per-destination statistics
-    print(
+    lines.append(
         f"  {'Destination':12s} | {'Avg Days':>9s} | {'On-Time':>10s} | {'Late':>10s} | {'Late %':>9s}"
     )
-    print("  " + "-" * 76)
+    lines.append("  " + "-" * 76)
 
-    for j in destinations:
-        dest_total = sum(shipment_counts.get((i, j), 0) for i in warehouses)
+    for j, dest_total, delivery_days, on_time_count in zip(
+        destinations, dest_actual, dest_delivery_days, dest_on_time
+    ):
         if dest_total > 0:
-            dest_delivery_days = sum(
-                shipment_counts.get((i, j), 0) * delivery_estimate[i][j]
-                for i in warehouses
-            )
-            dest_avg = dest_delivery_days / dest_total
+            dest_avg = delivery_days / dest_total
+            dest_late = dest_total - on_time_count
+            dest_late_pct = dest_late / dest_total * 100
 
-            dest_on_time = sum(
-                shipment_counts.get((i, j), 0)
-                for i in warehouses
-                if delivery_estimate[i][j] <= target_delivery_days
+            lines.append(
+                f"  {j:12s} | {dest_avg:9.2f} | {on_time_count:10,} | {dest_late:10,} | {dest_late_pct:8.2f}%"
             )
-            dest_late = dest_total - dest_on_time
-            dest_late_pct = (dest_late / dest_total * 100) if dest_total > 0 else 0
 
-            print(
-                f"  {j:12s} | {dest_avg:9.2f} | {dest_on_time:10,} | {dest_late:10,} | {dest_late_pct:8.2f}%"
-            )
+    lines.append("=" * 80)
 
-    print("=" * 80)
+    return lines
+
+
+def print_solution(
+    # solution as returned by get_solution
+    solution: dict,
+    warehouses: list[str],
+    destinations: list[str],
+    target_distribution: Dict[str, int],
+    warehouse_cost: Dict[str, float],
+    shipment_cost: Dict[str, Dict[str, float]],
+    target_delivery_days: int,
+    delivery_estimate: Dict[str, Dict[str, int]],
+) -> None:
+    """
+    Pretty print the solution of the shipment optimization problem.
+    """
+    lines = format_solution(
+        solution,
+        warehouses,
+        destinations,
+        target_distribution,
+        warehouse_cost,
+        shipment_cost,
+        target_delivery_days,
+        delivery_estimate,
+    )
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def input_row(prompt: str, size: int, convert, is_valid, error: str) -> list:
+    """
+    Prompt until one line of `size` space-separated values is entered that
+    all convert and pass is_valid. Returns the converted values.
+    """
+    while True:
+        values = input(prompt).split()
+        if len(values) != size:
+            print(f"    Error: Enter {size} values, one per destination")
+            continue
+        try:
+            row = [convert(value) for value in values]
+        except ValueError:
+            print("    Error: Please enter valid numbers")
+            continue
+        if all(is_valid(value) for value in row):
+            return row
+        print(f"    Error: {error}")
 
 
 def get_user_input() -> dict:
@@ -384,41 +644,33 @@ def get_user_input() -> dict:
     # Get shipment capacity
     print("SHIPMENT CAPACITY:")
     print("  (Maximum shipments from each warehouse to each destination)")
+    print(f"  (One line per warehouse, space-separated, in the order {destinations})")
     shipment_capacity = {}
     for i in warehouses:
-        shipment_capacity[i] = {}
-        for j in destinations:
-            while True:
-                try:
-                    val = int(input(f"  Capacity from '{i}' to '{j}': ").strip())
-                    if val >= 0:
-                        shipment_capacity[i][j] = val
-                        break
-                    else:
-                        print("    Error: Capacity must be non-negative")
-                except ValueError:
-                    print("    Error: Please enter a valid integer")
+        row = input_row(
+            f"  Capacities from '{i}': ",
+            len(destinations),
+            int,
+            lambda val: val >= 0,
+            "Capacity must be non-negative",
+        )
+        shipment_capacity[i] = dict(zip(destinations, row))
     print()
 
     # Get shipment costs
     print("SHIPMENT COSTS:")
     print("  (Cost per shipment from warehouse to destination)")
+    print(f"  (One line per warehouse, space-separated, in the order {destinations})")
     shipment_cost = {}
     for i in warehouses:
-        shipment_cost[i] = {}
-        for j in destinations:
-            while True:
-                try:
-                    val = float(
-                        input(f"  Cost per shipment from '{i}' to '{j}': $").strip()
-                    )
-                    if val > 0:
-                        shipment_cost[i][j] = val
-                        break
-                    else:
-                        print("    Error: Cost must be positive")
-                except ValueError:
-                    print("    Error: Please enter a valid number")
+        row = input_row(
+            f"  Costs per shipment from '{i}': $",
+            len(destinations),
+            float,
+            lambda val: val > 0,
+            "Cost must be positive",
+        )
+        shipment_cost[i] = dict(zip(destinations, row))
     print()
 
     # Get target delivery days
@@ -456,24 +708,17 @@ def get_user_input() -> dict:
     # Get delivery estimates
     print("DELIVERY ESTIMATES:")
     print("  (Estimated delivery days from each warehouse to each destination)")
+    print(f"  (One line per warehouse, space-separated, in the order {destinations})")
     delivery_estimate = {}
     for i in warehouses:
-        delivery_estimate[i] = {}
-        for j in destinations:
-            while True:
-                try:
-                    val = int(
-                        input(
-                            f"  Estimated delivery days from '{i}' to '{j}': "
-                        ).strip()
-                    )
-                    if val >= 1:
-                        delivery_estimate[i][j] = val
-                        break
-                    else:
-                        print("    Error: Must be at least 1 day")
-                except ValueError:
-                    print("    Error: Please enter a valid integer")
+        row = input_row(
+            f"  Estimated delivery days from '{i}': ",
+            len(destinations),
+            int,
+            lambda val: val >= 1,
+            "Must be at least 1 day",
+        )
+        delivery_estimate[i] = dict(zip(destinations, row))
     print()
 
     print("=" * 80)
@@ -494,14 +739,262 @@ def get_user_input() -> dict:
     }
 
 
-def main():
-    params = get_user_input()
+def is_integer(value) -> bool:
+    """
+    True for an integer read from JSON. bool is an int subclass but not a count.
+    """
+    return isinstance(value, int) and not isinstance(value, bool)
+
 
-    problem = optimize_shipments(**params)
-    problem.solve()
+def is_number(value) -> bool:
+    """
+    True for a finite integer or float read from JSON, excluding bool.
+    """
+    return (
+        isinstance(value, (int, float))
+        and not isinstance(value, bool)
+        and math.isfinite(value)
+    )
+
+
+def load_params(path: str) -> dict:
+    """
+    Load all fixed parameters from a JSON file instead of prompting for them.
+    The file holds the same dictionary get_user_input returns.
+    """
+    with open(path) as f:
+        params = json.load(f)
+
+    if not isinstance(params, dict):
+        raise ValueError(f"{path}: expected a JSON object of parameters")
+    missing = PARAM_KEYS - params.keys()
+    if missing:
+        raise ValueError(f"{path}: missing {', '.join(sorted(missing))}")
+    unknown = params.keys() - PARAM_KEYS
+    if unknown:
+        raise ValueError(f"{path}: unknown {', '.join(sorted(unknown))}")
+    for key in ("warehouses", "destinations"):
+        if not isinstance(params[key], list):
+            raise ValueError(f"{path}: {key} must be a list")
+    for key in (
+        "target_distribution",
+        "shipment_capacity",
+        "warehouse_cost",
+        "shipment_cost",
+        "delivery_estimate",
+    ):
+        if not isinstance(params[key], dict):
+            raise ValueError(f"{path}: {key} must be a dict")
+
+    warehouses = params["warehouses"]
+    destinations = params["destinations"]
+    for key in ("warehouses", "destinations"):
+        names = params[key]
+        if not names or not all(isinstance(name, str) and name for name in names):
+            raise ValueError(f"{path}: {key} must be a non-empty list of names")
+        if len(set(names)) != len(names):
+            raise ValueError(f"{path}: {key} must not repeat a name")
+    warehouse_set = set(warehouses)
+    dest_set = set(destinations)
+
+    if set(params["target_distribution"]) != dest_set:
+        raise ValueError(f"{path}: target_distribution needs every destination")
+    if set(params["warehouse_cost"]) != warehouse_set:
+        raise ValueError(f"{path}: warehouse_cost needs every warehouse")
+    for key in ("shipment_capacity", "shipment_cost", "delivery_estimate"):
+        if set(params[key]) != warehouse_set:
+            raise ValueError(f"{path}: {key} needs exactly one entry per warehouse")
+        for i in warehouses:
+            lanes = params[key][i]
+            if not isinstance(lanes, dict) or set(lanes) != dest_set:
+                raise ValueError(
+                    f"{path}: {key} for warehouse '{i}' needs every destination"
+                )
+
+    # the same checks get_user_input makes on each value it reads
+    def lane_values(key):
+        return [value for i in warehouses for value in params[key][i].values()]
+
+    value_checks = (
+        (
+            "target_distribution",
+            params["target_distribution"].values(),
+            lambda val: is_integer(val) and val >= 0,
+            "non-negative integers",
+        ),
+        (
+            "warehouse_cost",
+            params["warehouse_cost"].values(),
+            lambda val: is_number(val) and val >= 0,
+            "non-negative numbers",
+        ),
+        (
+            "shipment_capacity",
+            lane_values("shipment_capacity"),
+            lambda val: is_integer(val) and val >= 0,
+            "non-negative integers",
+        ),
+        (
+            "shipment_cost",
+            lane_values("shipment_cost"),
+            lambda val: is_number(val) and val > 0,
+            "positive numbers",
+        ),
+        (
+            "delivery_estimate",
+            lane_values("delivery_estimate"),
+            lambda val: is_integer(val) and val >= 1,
+            "integers of at least 1 day",
+        ),
+    )
+    for key, values, is_valid, requirement in value_checks:
+        if not all(is_valid(val) for val in values):
+            raise ValueError(f"{path}: {key} values must be {requirement}")
+
+    target_delivery_days = params["target_delivery_days"]
+    if not is_integer(target_delivery_days) or target_delivery_days <= 0:
+        raise ValueError(f"{path}: target_delivery_days must be a positive integer")
+    tolerance = params["delivery_tolerance"]
+    if not is_number(tolerance) or not 0 <= tolerance <= 1:
+        raise ValueError(f"{path}: delivery_tolerance must be between 0 and 1")
+
+    return params
+
+
+def get_solver(
+    name: str = "cbc",
+    threads: int | None = None,
+    gap: float = DEFAULT_GAP,
+    time_limit: float | None = DEFAULT_TIME_LIMIT,
+    warm_start: bool = False,
+) -> pulp.LpSolver:
+    """
+    Return the solver by name (one of SOLVERS), quiet, stopping at the given
+    relative gap or time limit. CBC and HiGHS run on the given number of
+    threads (default one per CPU); GLPK is single-threaded. With warm_start
+    CBC and HiGHS start from the variables' initial values; GLPK ignores them.
+    """
+    if name not in SOLVERS:
+        raise ValueError(f"Unknown solver '{name}', expected one of {SOLVERS}")
+
+    threads = threads or os.cpu_count()
+    if name == "highs":
+        # the highs binary, as in the carrier script
+        return pulp.HiGHS_CMD(
+            msg=False,
+            threads=threads,
+            gapRel=gap,
+            timeLimit=time_limit,
+            warmStart=warm_start,
+        )
+    if name == "glpk":
+        return pulp.GLPK_CMD(
+            msg=False, timeLimit=time_limit, options=["--mipgap", str(gap)]
+        )
+    return pulp.PULP_CBC_CMD(
+        msg=False,
+        threads=threads,
+        gapRel=gap,
+        timeLimit=time_limit,
+        warmStart=warm_start,
+    )
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """
+    Parse command line options for the warehouse shipment optimization.
+    """
+    parser = argparse.ArgumentParser(
+        description="Optimize warehouse-to-destination shipment routing."
+    )
+    parser.add_argument(
+        "--config",
+        metavar="PATH",
+        help="read the parameters from a JSON file instead of prompting",
+    )
+    parser.add_argument(
+        "--solver",
+        choices=SOLVERS,
+        default="cbc",
+        help="solver backend (default: cbc)",
+    )
+    parser.add_argument(
+        "--threads",
+        type=int,
+        help="solver threads (default: one per CPU)",
+    )
+    parser.add_argument(
+        "--gap",
+        type=float,
+        default=DEFAULT_GAP,
+        help=f"relative MIP gap at which the solver stops (default: {DEFAULT_GAP})",
+    )
+    parser.add_argument(
+        "--time-limit",
+        type=float,
+        default=DEFAULT_TIME_LIMIT,
+        metavar="SECONDS",
+        help=f"solver time limit (default: {DEFAULT_TIME_LIMIT})",
+    )
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="print only the solver status and total cost instead of the report",
+    )
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args()
+    if args.config:
+        try:
+            params = load_params(args.config)
+        except (OSError, ValueError) as e:
+            sys.exit(f"Error: {e}")
+    else:
+        params = get_user_input()
+
+    problem, shipment_count, warehouse_usage = optimize_shipments(**params)
+    plan = greedy_shipments(
+        params["warehouses"],
+        params["destinations"],
+        params["target_distribution"],
+        params["shipment_capacity"],
+        params["shipment_cost"],
+        params["target_delivery_days"],
+        params["delivery_tolerance"],
+        params["delivery_estimate"],
+    )
+    if plan is not None:
+        set_initial_values(shipment_count, warehouse_usage, plan)
+    solver = get_solver(
+        args.solver,
+        args.threads,
+        args.gap,
+        args.time_limit,
+        warm_start=plan is not None,
+    )
+    if not solver.available():
+        sys.exit(
+            f"Error: solver '{args.solver}' is not installed; install it or "
+            "choose another with --solver"
+        )
+    problem.solve(solver)
+
+    solution = get_solution(problem, shipment_count, warehouse_usage)
+    if args.quiet:
+        # status and total cost only, without building the report
+        status = pulp.LpStatus[solution["status"]]
+        if solution["sol_status"] == pulp.LpSolutionIntegerFeasible:
+            print(f"Best found (not proven optimal): ${solution['objective']:,.2f}")
+        elif solution["status"] == pulp.LpStatusOptimal:
+            print(f"{status}: ${solution['objective']:,.2f}")
+        else:
+            print(status)
+        return
 
     print_solution(
-        problem,
+        solution,
         params["warehouses"],
         params["destinations"],
         params["target_distribution"],